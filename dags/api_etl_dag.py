@@ -1,17 +1,19 @@
 """
 Config-driven ETL DAG (TaskFlow API) orchestrating extract -> validate -> transform -> load.
 Works for any YAML in configs/ by passing params.api_config (e.g., sample_api).
-Schedule is read from the default config chosen at parse time via AIRFLOW_API_CONFIG env var.
+Schedule is read from the default config chosen at parse time via AIRFLOW_API_CONFIG env var,
+unless AIRFLOW_API_CONFIG_SCHEDULE pins it (use "none" for manual-only runs).
 """
 
 import os
 import sys
-import yaml
+import json
 from datetime import timedelta
 
 from airflow import DAG
 from airflow.decorators import task
 from airflow.utils.dates import days_ago
+from airflow.utils.dag_parsing_context import get_parsing_context
 from airflow.exceptions import AirflowException
 
 # Ensure src/ is importable inside Airflow container
@@ -22,11 +24,8 @@ SRC_PATH = os.path.join(AIRFLOW_ROOT, "src")
 if SRC_PATH not in sys.path:
     sys.path.append(SRC_PATH)
 
-from src.extractors.api_adapter import extract_api  # noqa: E402
-from src.validators.schema_validator import validate_schema  # noqa: E402
-from src.transformers.data_transformer import transform_data  # noqa: E402
-from src.loaders.postgres_loader import load_to_postgres  # noqa: E402
-from src.utils.airflow_callbacks import task_failure_alert  # noqa: E402
+# Pipeline modules (pandas, sqlalchemy, ...) are imported inside the tasks so the
+# scheduler's frequent re-parses of this file only pay for Airflow itself.
 
 
 def _get_default_api_config() -> str:
@@ -34,17 +33,38 @@ def _get_default_api_config() -> str:
 
 
 def _get_schedule_from_config(api_config: str):
+    # A pinned schedule avoids touching the config on every scheduler parse
+    pinned = os.environ.get("AIRFLOW_API_CONFIG_SCHEDULE")
+    if pinned:
+        return None if pinned.lower() == "none" else pinned
+    # Parsed while running a task of another DAG: the schedule is never used
+    if get_parsing_context().dag_id not in (None, "api_etl_dag"):
+        return None
     cfg_path = os.path.join(AIRFLOW_ROOT, "configs", f"{api_config}.yaml")
     if not os.path.exists(cfg_path):
         return None
+    # Sidecar written by `python src/utils/config_cache.py configs`; used unless the YAML is newer
+    sidecar_path = os.path.join(AIRFLOW_ROOT, "configs", f"{api_config}.schedule.json")
+    try:
+        if os.path.getmtime(sidecar_path) >= os.path.getmtime(cfg_path):
+            with open(sidecar_path, "r") as f:
+                return json.loads(f.read()).get("schedule")
+    except (OSError, ValueError):
+        pass
     try:
-        with open(cfg_path, "r") as f:
-            cfg = yaml.safe_load(f)
-        return cfg.get("schedule")
+        from src.utils.config_cache import load_config
+
+        return load_config(cfg_path).get("schedule")
     except Exception:
         return None
 
 
+def _task_failure_alert(context):
+    from src.utils.airflow_callbacks import task_failure_alert
+
+    task_failure_alert(context)
+
+
 default_api_config = _get_default_api_config()
 
 dag_schedule = _get_schedule_from_config(default_api_config)
@@ -58,7 +78,7 @@ with DAG(
     params={
         "api_config": default_api_config,  # can be overridden on manual trigger
     },
-    on_failure_callback=task_failure_alert,
+    on_failure_callback=_task_failure_alert,
     max_active_runs=1,
 ) as dag:
 
@@ -71,6 +91,8 @@ with DAG(
         api_cfg = context["params"].get("api_config", default_api_config)
         execution_date = context.get("ds")  # YYYY-MM-DD
         config_path = os.path.join(AIRFLOW_ROOT, "configs", f"{api_cfg}.yaml")
+        from src.extractors.api_adapter import extract_api
+
         saved_files = extract_api(config_path, execution_date)
         # Return a small summary to XCom
         return {"files": len(saved_files)}
@@ -83,6 +105,8 @@ with DAG(
         api_cfg = context["params"].get("api_config", default_api_config)
         execution_date = context.get("ds")
         config_path = os.path.join(AIRFLOW_ROOT, "configs", f"{api_cfg}.yaml")
+        from src.validators.schema_validator import validate_schema
+
         report = validate_schema(config_path, execution_date)
         # Fail fast if any validation errors reported, except benign "No data found."
         errors = report.get("errors", [])
@@ -93,31 +117,43 @@ with DAG(
             e for e in errors
             if lower(e) != "no data found." and not lower(e).startswith("duplicate values found in unique_keys")
         ]
-    if non_benign_errors or invalid > 0:
+        if non_benign_errors or invalid > 0:
             raise AirflowException(
                 f"Validation failed: invalid_rows={invalid}, errors_count={len(non_benign_errors)}"
             )
-    # For no-data runs, just pass zeros and a note; downstream tasks can handle empty transforms
-    note = "no data" if errors and not non_benign_errors else ""
-    return {"valid_rows": valid, "invalid_rows": invalid, "note": note}
+        # For no-data runs, just pass zeros and a note; downstream tasks can handle empty transforms
+        note = "no data" if errors and not non_benign_errors else ""
+        return {"valid_rows": valid, "invalid_rows": invalid, "note": note}
 
     @task()
     def transform(**context):
         api_cfg = context["params"].get("api_config", default_api_config)
         execution_date = context.get("ds")
         config_path = os.path.join(AIRFLOW_ROOT, "configs", f"{api_cfg}.yaml")
-        df = transform_data(config_path, execution_date)
-        # Avoid large XComs: return only counts
+        from src.transformers.data_transformer import transform_and_stage
+
+        df, staging_path = transform_and_stage(config_path, execution_date)
+        # Avoid large XComs: return only counts and where the frame was staged
         row_count = 0 if df is None else int(getattr(df, "shape", [0])[0])
-        return {"rows": row_count}
+        return {"rows": row_count, "staging_path": staging_path}
 
     @task()
-    def load(**context):
+    def load(staged: dict, **context):
         api_cfg = context["params"].get("api_config", default_api_config)
         execution_date = context.get("ds")
         config_path = os.path.join(AIRFLOW_ROOT, "configs", f"{api_cfg}.yaml")
-        result = load_to_postgres(config_path, execution_date)
+        from src.loaders.postgres_loader import load_to_postgres
+
+        result = load_to_postgres(config_path, execution_date, staged.get("staging_path"))
         return result
 
+    @task()
+    def cleanup_staging(staged: dict):
+        staging_path = staged.get("staging_path")
+        if staging_path and os.path.exists(staging_path):
+            os.remove(staging_path)
+
     # Task ordering
-    extract() >> validate() >> transform() >> load()
+    staged = transform()
+    extract() >> validate() >> staged
+    load(staged) >> cleanup_staging(staged)
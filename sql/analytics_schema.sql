@@ -2,10 +2,10 @@
 -- This table is created automatically by the postgres_loader.py
 
 CREATE TABLE IF NOT EXISTS github_events (
-    event_id INTEGER PRIMARY KEY,
+    event_id BIGINT PRIMARY KEY,
     event_type VARCHAR(500),
     event_time TIMESTAMP,
-    repo_id INTEGER,
+    repo_id BIGINT,
     user_login VARCHAR(500),
     ingestion_timestamp TIMESTAMP,
     source VARCHAR(500)
@@ -25,6 +25,8 @@ CREATE TABLE IF NOT EXISTS pipeline_monitor (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE INDEX IF NOT EXISTS ix_pipeline_monitor_created_at ON pipeline_monitor (created_at);
+
 -- Example queries for monitoring
 
 -- Check recent pipeline runs
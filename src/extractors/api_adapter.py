@@ -1,13 +1,15 @@
 import os
 import sys
-import json
 import time
-import yaml
+import functools
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from src.utils.config_cache import load_config
+from src.utils.json_io import loads
 
 try:
     from airflow.hooks.base import BaseHook
@@ -20,10 +22,77 @@ def get_airflow_connection(conn_id: str):
     conn = BaseHook.get_connection(conn_id)
     return conn
 
+# Built once at import; every session mounts the same retry policy and connection pool
+_RETRY = Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+               allowed_methods=frozenset(['GET']))
+_ADAPTER = HTTPAdapter(max_retries=_RETRY, pool_connections=10, pool_maxsize=20)
+
+@functools.lru_cache(maxsize=8)
+def _get_session(auth_headers: tuple) -> requests.Session:
+    """Get a pooled session with retries for the given auth headers, reused across calls."""
+    session = requests.Session()
+    session.mount('https://', _ADAPTER)
+    session.mount('http://', _ADAPTER)
+    session.headers.update(dict(auth_headers))
+    return session
+
+def _check_response(resp) -> bool:
+    if resp.status_code == 401:
+        print("Authentication failed (401). Exiting.")
+        return False
+    if resp.status_code >= 400:
+        print(f"HTTP error {resp.status_code}: {resp.text}")
+        return False
+    return True
+
+def _save_response(out_path: str, content: bytes) -> None:
+    # Raw files are intermediate artifacts: keep the API's bytes as-is
+    with open(out_path, 'wb') as f:
+        f.write(content)
+
+def _extract_pages_concurrently(session, url, params, pagination, out_dir,
+                                concurrency: int, sleep_time: float) -> List[str]:
+    """Fetch page-numbered responses in flights of `concurrency` requests.
+
+    Request starts stay spaced by the rate-limit interval; a flight only overlaps
+    their round-trips. Stops at the first failed or empty page, like the serial loop.
+    """
+    def fetch(page):
+        req_params = params.copy()
+        req_params[pagination['page_param']] = page
+        return session.get(url, params=req_params, timeout=30)
+
+    saved_files = []
+    page_num = pagination.get('start_page', 1)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            futures = []
+            for offset in range(concurrency):
+                if futures and sleep_time > 0:
+                    time.sleep(sleep_time)
+                futures.append(executor.submit(fetch, page_num + offset))
+            # Handle responses in page order so file numbering matches the serial path
+            for future in futures:
+                try:
+                    resp = future.result()
+                except Exception as e:
+                    print(f"Request failed: {e}")
+                    return saved_files
+                if not _check_response(resp):
+                    return saved_files
+                data = loads(resp.content)
+                if not data or (isinstance(data, list) and len(data) == 0):
+                    return saved_files
+                out_path = os.path.join(out_dir, f"response_{len(saved_files) + 1:03d}.json")
+                _save_response(out_path, resp.content)
+                saved_files.append(out_path)
+            page_num += concurrency
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+
 def extract_api(config_path: str, execution_date: Optional[str] = None) -> List[str]:
     # Load config
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config(config_path)
 
     api_name = config['name']
     base_url = config['base_url']
@@ -43,12 +112,6 @@ def extract_api(config_path: str, execution_date: Optional[str] = None) -> List[
     out_dir = os.path.join('data', 'raw', api_name, execution_date)
     os.makedirs(out_dir, exist_ok=True)
 
-    # Setup requests session with retries
-    session = requests.Session()
-    retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-    session.mount('https://', HTTPAdapter(max_retries=retries))
-    session.mount('http://', HTTPAdapter(max_retries=retries))
-
     # Handle auth
     headers = {}
     if auth_cfg['type'] == 'api_key':
@@ -70,12 +133,21 @@ def extract_api(config_path: str, execution_date: Optional[str] = None) -> List[
         headers['Authorization'] = f'Bearer {token}'
     # else: no auth
 
+    # Reuse a keep-alive session per credential set; auth headers are set on it once
+    session = _get_session(tuple(sorted(headers.items())))
+
+    url = base_url.rstrip('/') + endpoint
+    # Page-numbered APIs can opt into overlapping requests via pagination.concurrency
+    concurrency = int(pagination.get('concurrency', 1)) if pagination else 1
+    if pagination and pagination['type'] == 'page' and concurrency > 1:
+        return _extract_pages_concurrently(session, url, params, pagination, out_dir,
+                                           concurrency, sleep_time)
+
     saved_files = []
     page_num = pagination.get('start_page', 1) if pagination else 1
     cursor = None
     has_more = True
     response_idx = 1
-    url = base_url.rstrip('/') + endpoint
     while has_more:
         req_params = params.copy()
         # Pagination logic
@@ -85,17 +157,13 @@ def extract_api(config_path: str, execution_date: Optional[str] = None) -> List[
             elif pagination['type'] == 'cursor' and cursor:
                 req_params[pagination['cursor_param']] = cursor
         try:
-            resp = session.get(url, params=req_params, headers=headers, timeout=30)
+            resp = session.get(url, params=req_params, timeout=30)
         except Exception as e:
             print(f"Request failed: {e}")
             break
-        if resp.status_code == 401:
-            print("Authentication failed (401). Exiting.")
-            break
-        if resp.status_code >= 400:
-            print(f"HTTP error {resp.status_code}: {resp.text}")
+        if not _check_response(resp):
             break
-        data = resp.json()
+        data = loads(resp.content)
         # For page-based pagination, only save non-empty responses
         if pagination and pagination['type'] == 'page':
             if not data or (isinstance(data, list) and len(data) == 0):
@@ -103,16 +171,14 @@ def extract_api(config_path: str, execution_date: Optional[str] = None) -> List[
                 break  # Do not save empty response
             else:
                 out_path = os.path.join(out_dir, f"response_{response_idx:03d}.json")
-                with open(out_path, 'w') as f:
-                    json.dump(data, f, indent=2)
+                _save_response(out_path, resp.content)
                 saved_files.append(out_path)
                 response_idx += 1
                 page_num += 1
         else:
             # For other pagination types, save all responses
             out_path = os.path.join(out_dir, f"response_{response_idx:03d}.json")
-            with open(out_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            _save_response(out_path, resp.content)
             saved_files.append(out_path)
             response_idx += 1
             if pagination:
@@ -1,5 +1,6 @@
+import io
 import os
-import yaml
+import functools
 import uuid
 import time
 import pandas as pd
@@ -8,12 +9,30 @@ from datetime import datetime, timezone
 from sqlalchemy import create_engine, text, MetaData, Table, Column, String, Integer, Float, DateTime, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.exc import SQLAlchemyError
+from src.utils.config_cache import load_config
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows serialized per COPY buffer; bounds memory on large DataFrames
+COPY_CHUNK_ROWS = 100_000
+# Column type per numpy dtype kind for auto-created analytics tables
+KIND_TO_SQL = {
+    'i': 'BIGINT',
+    'u': 'BIGINT',
+    'f': 'DOUBLE PRECISION',
+    'M': 'TIMESTAMP',
+    'b': 'BOOLEAN',
+    'O': 'VARCHAR(500)',
+    'U': 'VARCHAR(500)',
+}
+# Rows submitted per batch unless the config sets load.chunksize
+DEFAULT_CHUNKSIZE = 5000
+# Rows per multi-VALUES statement for the ON CONFLICT upsert
+EXECUTE_VALUES_PAGE_SIZE = 1000
+
 
 def _get_postgres_connection() -> str:
     """Get PostgreSQL connection string from environment variables."""
@@ -27,6 +46,21 @@ def _get_postgres_connection() -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{database}"
 
 
+@functools.lru_cache(maxsize=4)
+def _get_engine(connection_string: str):
+    """Get a pooled engine for the connection string, reused across loads in this process."""
+    return create_engine(
+        connection_string,
+        pool_size=5,
+        max_overflow=10,
+        pool_recycle=1800,  # Stay under server/proxy idle timeouts in long-lived workers
+        pool_pre_ping=True,
+        executemany_mode='values_plus_batch',
+        insertmanyvalues_page_size=10000,
+        executemany_batch_page_size=500,
+    )
+
+
 def _create_pipeline_monitor_table(engine):
     """Create pipeline_monitor table if it doesn't exist."""
     metadata = MetaData()
@@ -40,7 +74,7 @@ def _create_pipeline_monitor_table(engine):
           Column('duration_sec', Float, nullable=False),
           Column('status', String(20), nullable=False),  # 'success' or 'failed'
           Column('error_message', Text, nullable=True),
-          Column('created_at', DateTime, default=datetime.utcnow)
+          Column('created_at', DateTime, default=datetime.utcnow, index=True)
     )
     
     # Create table if not exists
@@ -48,31 +82,27 @@ def _create_pipeline_monitor_table(engine):
     logger.info("Pipeline monitor table ready")
 
 
-def _create_analytics_table(engine, table_name: str, df: pd.DataFrame, unique_keys: Optional[List[str]] = None):
-    """Create analytics table if it doesn't exist."""
-    # Generate CREATE TABLE SQL based on DataFrame schema
-    columns = []
-    for col, dtype in df.dtypes.items():
-        if 'int' in str(dtype):
-            sql_type = 'INTEGER'
-        elif 'float' in str(dtype):
-            sql_type = 'DOUBLE PRECISION'
-        elif 'datetime' in str(dtype):
-            sql_type = 'TIMESTAMP'
-        else:
-            sql_type = 'VARCHAR(500)'
-        
-        columns.append(f"{col} {sql_type}")
+@functools.lru_cache(maxsize=64)
+def _analytics_table_sql(table_name: str, column_kinds: tuple, unique_keys: tuple) -> str:
+    """Build CREATE TABLE SQL for a (table, schema) pair; cached since runs repeat it."""
+    columns = [f"{col} {KIND_TO_SQL.get(kind, 'VARCHAR(500)')}" for col, kind in column_kinds]
     
     # Add primary key if unique_keys provided
     if unique_keys:
         columns.append(f"PRIMARY KEY ({', '.join(unique_keys)})")
     
-    create_sql = f"""
+    return f"""
     CREATE TABLE IF NOT EXISTS {table_name} (
         {', '.join(columns)}
     )
     """
+
+
+def _create_analytics_table(engine, table_name: str, df: pd.DataFrame, unique_keys: Optional[List[str]] = None):
+    """Create analytics table if it doesn't exist."""
+    # Generate CREATE TABLE SQL based on DataFrame schema
+    column_kinds = tuple((col, dtype.kind) for col, dtype in df.dtypes.items())
+    create_sql = _analytics_table_sql(table_name, column_kinds, tuple(unique_keys or ()))
     
     with engine.begin() as conn:
         conn.execute(text(create_sql))
@@ -80,7 +110,58 @@ def _create_analytics_table(engine, table_name: str, df: pd.DataFrame, unique_ke
     logger.info(f"Analytics table '{table_name}' ready")
 
 
-def _upsert_data(engine, table_name: str, df: pd.DataFrame, unique_keys: Optional[List[str]] = None, run_date: str = None):
+def _uses_psycopg2(engine) -> bool:
+    """COPY and execute_values are psycopg2 APIs; other drivers use the SQLAlchemy paths."""
+    return engine.dialect.driver == 'psycopg2'
+
+
+def _copy_dataframe(conn, table_name: str, df: pd.DataFrame, chunk_rows: int = COPY_CHUNK_ROWS):
+    """Bulk load a DataFrame with COPY ... FROM STDIN inside the caller's transaction."""
+    copy_sql = (
+        f"COPY {table_name} ({', '.join(df.columns)}) "
+        f"FROM STDIN WITH (FORMAT CSV, DELIMITER E'\\t', NULL '\\N')"
+    )
+    # Reuse the DBAPI connection behind the SQLAlchemy one so COPY shares the transaction
+    cursor = conn.connection.cursor()
+    try:
+        for start in range(0, len(df), chunk_rows):
+            buf = io.StringIO()
+            df.iloc[start:start + chunk_rows].to_csv(buf, index=False, header=False, sep='\t', na_rep='\\N')
+            buf.seek(0)
+            cursor.copy_expert(copy_sql, buf)
+    finally:
+        cursor.close()
+
+
+def _execute_values(engine, insert_sql: str, df: pd.DataFrame, chunksize: int = DEFAULT_CHUNKSIZE,
+                    page_size: int = EXECUTE_VALUES_PAGE_SIZE) -> int:
+    """Run a `VALUES %s` statement through psycopg2 execute_values in a single transaction."""
+    from psycopg2.extras import execute_values
+    
+    raw_conn = engine.raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        rows_affected = 0
+        # Convert chunk by chunk so only `chunksize` boxed rows are alive at once
+        for chunk_start in range(0, len(df), chunksize):
+            chunk = df.iloc[chunk_start:chunk_start + chunksize]
+            # psycopg2 cannot adapt numpy scalars or pd.NA/NaT, so box values as Python objects/None
+            values = list(chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None))
+            # Page explicitly: execute_values only reports rowcount for its last page
+            for start in range(0, len(values), page_size):
+                execute_values(cursor, insert_sql, values[start:start + page_size], page_size=page_size)
+                rows_affected += cursor.rowcount
+        raw_conn.commit()
+        return rows_affected
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
+
+def _upsert_data(engine, table_name: str, df: pd.DataFrame, unique_keys: Optional[List[str]] = None, run_date: str = None,
+                 chunksize: int = DEFAULT_CHUNKSIZE):
     """Upsert data using either ON CONFLICT or DELETE+INSERT strategy."""
     if df.empty:
         logger.info("No data to upsert")
@@ -90,32 +171,39 @@ def _upsert_data(engine, table_name: str, df: pd.DataFrame, unique_keys: Optiona
         # Strategy 1: INSERT ... ON CONFLICT DO UPDATE
         logger.info(f"Using UPSERT strategy with unique keys: {unique_keys}")
         
-        # Convert DataFrame to list of dicts for insertion
-        records = df.to_dict('records')
-        
-        # Build INSERT statement
-        columns = list(df.columns)
-        placeholders = ', '.join([f':{col}' for col in columns])
-        insert_sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
-        
         # Build ON CONFLICT clause
+        columns = list(df.columns)
         conflict_columns = ', '.join(unique_keys)
         update_clause = ', '.join([f"{col} = EXCLUDED.{col}" for col in columns if col not in unique_keys])
         if update_clause:
-            insert_sql += f" ON CONFLICT ({conflict_columns}) DO UPDATE SET {update_clause}"
+            conflict_sql = f" ON CONFLICT ({conflict_columns}) DO UPDATE SET {update_clause}"
         else:
-            insert_sql += f" ON CONFLICT ({conflict_columns}) DO NOTHING"
+            conflict_sql = f" ON CONFLICT ({conflict_columns}) DO NOTHING"
+        
+        if _uses_psycopg2(engine):
+            # Positional tuples, one multi-VALUES statement per page instead of one round-trip per row
+            insert_sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES %s" + conflict_sql
+            rows_affected = _execute_values(engine, insert_sql, df, chunksize)
+            logger.info(f"UPSERT completed: {rows_affected} rows affected")
+            return rows_affected
+        
+        # Other drivers take named parameters via text(): build dicts one chunk at a time
+        placeholders = ', '.join([f':{col}' for col in columns])
+        insert_sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})" + conflict_sql
         
         # Use connect() so tests that mock engine.connect capture execute() and rowcount
         with engine.connect() as conn:
             trans = conn.begin()
             try:
-                result = conn.execute(text(insert_sql), records)
+                rows_affected = 0
+                for start in range(0, len(df), chunksize):
+                    records = df.iloc[start:start + chunksize].to_dict('records')
+                    result = conn.execute(text(insert_sql), records)
+                    rows_affected += result.rowcount
                 trans.commit()
             except Exception:
                 trans.rollback()
                 raise
-            rows_affected = result.rowcount
             logger.info(f"UPSERT completed: {rows_affected} rows affected")
             return rows_affected
     
@@ -128,8 +216,11 @@ def _upsert_data(engine, table_name: str, df: pd.DataFrame, unique_keys: Optiona
             delete_sql = f"DELETE FROM {table_name} WHERE run_date = :run_date"
             conn.execute(text(delete_sql), {'run_date': run_date})
             
-            # Insert new data
-            df.to_sql(table_name, conn, if_exists='append', index=False, method='multi')
+            # Insert new data (COPY via psycopg2, multi-row INSERT elsewhere)
+            if _uses_psycopg2(engine):
+                _copy_dataframe(conn, table_name, df)
+            else:
+                df.to_sql(table_name, conn, if_exists='append', index=False, method='multi', chunksize=chunksize)
             
             rows_affected = len(df)
             logger.info(f"DELETE+INSERT completed: {rows_affected} rows inserted")
@@ -160,13 +251,15 @@ def _log_pipeline_run(engine, run_id: str, dag_id: str, run_date: str,
     logger.info(f"Pipeline run logged: {run_id} - {status}")
 
 
-def load_to_postgres(config_path: str, execution_date: str) -> Dict[str, Any]:
+def load_to_postgres(config_path: str, execution_date: str, staging_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Load transformed data to Postgres with idempotent behavior.
     
     Args:
         config_path: Path to YAML config file
         execution_date: Execution date in YYYY-MM-DD format
+        staging_path: Feather file written by the transform step; transform_data
+            is re-run when it is not given or no longer exists
     
     Returns:
         Dict with run details: run_id, rows_processed, duration_sec, status
@@ -176,23 +269,27 @@ def load_to_postgres(config_path: str, execution_date: str) -> Dict[str, Any]:
     
     try:
         # Load config
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_config(config_path)
         
         api_name = config['name']
         output_table = config.get('output_table', f"{api_name}_events")
         unique_keys = config.get('unique_keys', [])
+        chunksize = int(config.get('load', {}).get('chunksize', DEFAULT_CHUNKSIZE))
         
         # Get database connection
         connection_string = _get_postgres_connection()
-        engine = create_engine(connection_string)
+        engine = _get_engine(connection_string)
         
         # Ensure pipeline_monitor table exists
         _create_pipeline_monitor_table(engine)
         
-        # Load transformed data
-        from src.transformers.data_transformer import transform_data
-        df = transform_data(config_path, execution_date)
+        # Load transformed data, preferring the frame staged by the transform step
+        if staging_path and os.path.exists(staging_path):
+            logger.info(f"Reading staged data from {staging_path}")
+            df = pd.read_feather(staging_path)
+        else:
+            from src.transformers.data_transformer import transform_data
+            df = transform_data(config_path, execution_date)
         
         if df.empty:
             logger.warning("No transformed data to load")
@@ -213,7 +310,7 @@ def load_to_postgres(config_path: str, execution_date: str) -> Dict[str, Any]:
             df['run_date'] = execution_date
         
         # Upsert data
-        rows_processed = _upsert_data(engine, output_table, df, unique_keys, execution_date)
+        rows_processed = _upsert_data(engine, output_table, df, unique_keys, execution_date, chunksize)
         
         duration = time.time() - start_time
         
@@ -249,7 +346,8 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('config_path', type=str)
     parser.add_argument('execution_date', type=str)
+    parser.add_argument('--staging_path', type=str, default=None)
     args = parser.parse_args()
     
-    result = load_to_postgres(args.config_path, args.execution_date)
+    result = load_to_postgres(args.config_path, args.execution_date, args.staging_path)
     print(f"Load result: {result}")
@@ -1,28 +1,54 @@
 import os
-import json
-import yaml
-import glob
+import logging
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
+from src.utils.config_cache import load_config
+from src.utils.json_io import dump_records, list_json_files, load_rows
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+_BOOL_STRINGS = {
+    'true': True, '1': True, 'yes': True, 'y': True, 't': True,
+    'false': False, '0': False, 'no': False, 'n': False, 'f': False,
+}
 
 
 def _load_rows(raw_dir: str) -> List[Dict[str, Any]]:
-    rows: List[Dict[str, Any]] = []
-    for file in sorted(glob.glob(os.path.join(raw_dir, '*.json'))):
-        with open(file, 'r') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                rows.extend(data)
-            elif isinstance(data, dict):
-                rows.append(data)
-    return rows
+    return load_rows(list_json_files(raw_dir))
+
+
+def _flatten_rows(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Flatten nested records into dot-separated columns, in Arrow when the rows allow it."""
+    if pa is not None:
+        try:
+            records = pa.array(rows)
+            if pa.types.is_struct(records.type):
+                table = pa.Table.from_arrays(records.flatten(), names=[field.name for field in records.type])
+                while any(pa.types.is_struct(field.type) for field in table.schema):
+                    table = table.flatten()
+                if table.num_columns:
+                    df = table.to_pandas()
+                    # to_pandas yields numpy arrays for list fields; keep Python lists as json_normalize does
+                    for field in table.schema:
+                        if pa.types.is_list(field.type) or pa.types.is_large_list(field.type):
+                            df[field.name] = pd.Series(table.column(field.name).to_pylist(), index=df.index, dtype=object)
+                    return df
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, OverflowError):
+            pass  # Rows disagree on a field's type or exceed int64; json_normalize copes with that
+    return pd.json_normalize(rows, sep='.')
 
 
 def _convert_series(series: pd.Series, target_type: str, fmt: Optional[str] = None,
                      scale: Optional[float] = None, offset: Optional[float] = None) -> pd.Series:
     if target_type == 'datetime':
-        converted = pd.to_datetime(series, format=fmt, errors='coerce', utc=True)
+        converted = pd.to_datetime(series, format=fmt, errors='coerce', utc=True, cache=True)
         # Return naive UTC or keep timezone-aware? We'll make naive in UTC for analytics
         return converted.dt.tz_convert(None)
     if target_type == 'int':
@@ -30,21 +56,9 @@ def _convert_series(series: pd.Series, target_type: str, fmt: Optional[str] = No
     elif target_type == 'float':
         converted = pd.to_numeric(series, errors='coerce').astype('Float64')
     elif target_type == 'bool':
-        # Handle various truthy/falsey strings
-        truthy = {'true', '1', 'yes', 'y', 't'}
-        falsy = {'false', '0', 'no', 'n', 'f'}
-        def to_bool(x):
-            if isinstance(x, bool):
-                return x
-            if pd.isna(x):
-                return pd.NA
-            s = str(x).strip().lower()
-            if s in truthy:
-                return True
-            if s in falsy:
-                return False
-            return pd.NA
-        converted = series.map(to_bool).astype('boolean')
+        # Handle various truthy/falsey strings with vectorized string ops
+        normalized = series.astype('string').str.strip().str.lower()
+        converted = normalized.map(_BOOL_STRINGS).astype('boolean')
     else:  # string
         converted = series.astype('string')
     # Apply unit conversions if provided
@@ -61,12 +75,7 @@ def _convert_series(series: pd.Series, target_type: str, fmt: Optional[str] = No
     return converted
 
 
-def transform_data(config_path: str, execution_date: str) -> pd.DataFrame:
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    api_name = config['name']
-    mappings: List[Dict[str, Any]] = config.get('mappings', [])
-
+def _resolve_base_dir(config_path: str, api_name: str, execution_date: str) -> str:
     # Resolve base directory robustly for both Docker and tests/local runs
     cfg_dir = os.path.dirname(os.path.abspath(config_path))
     candidates = []
@@ -74,29 +83,64 @@ def transform_data(config_path: str, execution_date: str) -> pd.DataFrame:
         candidates.append('/opt/airflow')
     candidates.append(cfg_dir)
     candidates.append(os.path.dirname(cfg_dir))
-    base_dir = cfg_dir
     for cand in candidates:
         candidate_raw = os.path.join(cand, 'data', 'raw', api_name, execution_date)
         if os.path.isdir(candidate_raw):
-            base_dir = cand
-            break
-    
+            return cand
+    return cfg_dir
+
+
+def _staging_file(base_dir: str, api_name: str, execution_date: str) -> str:
+    return os.path.join(base_dir, 'data', 'staging', api_name, f'{execution_date}.feather')
+
+
+def _write_staging(df: pd.DataFrame, path: str) -> Optional[str]:
+    # Arrow IPC keeps dtypes and lets load skip re-running the transform
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        df.to_feather(path, compression='lz4')
+    except ImportError:
+        logger.warning("pyarrow not installed; skipping staged output")
+        # A file left by an earlier run must not be mistaken for this one
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+    return path
+
+
+def transform_data(config_path: str, execution_date: str) -> pd.DataFrame:
+    return _transform(config_path, execution_date)[0]
+
+
+def transform_and_stage(config_path: str, execution_date: str) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Run transform_data and stage its output as Feather for the load step.
+
+    Returns the frame and the staged file's path, or None when nothing was staged.
+    """
+    df, staging_path = _transform(config_path, execution_date)
+    return df, _write_staging(df, staging_path)
+
+
+def _transform(config_path: str, execution_date: str) -> Tuple[pd.DataFrame, str]:
+    config = load_config(config_path)
+    api_name = config['name']
+    mappings: List[Dict[str, Any]] = config.get('mappings', [])
+
+    base_dir = _resolve_base_dir(config_path, api_name, execution_date)
+    staging_path = _staging_file(base_dir, api_name, execution_date)
     raw_dir = os.path.join(base_dir, 'data', 'raw', api_name, execution_date)
     invalid_dir = os.path.join(base_dir, 'data', 'invalid', api_name, execution_date)
     os.makedirs(invalid_dir, exist_ok=True)
 
     rows = _load_rows(raw_dir)
     if not rows:
-        return pd.DataFrame(columns=[m['target'] for m in mappings] + ['ingestion_timestamp', 'source'])
+        return pd.DataFrame(columns=[m['target'] for m in mappings] + ['ingestion_timestamp', 'source']), staging_path
 
     # Flatten nested structures with dot notation
-    df_flat = pd.json_normalize(rows, sep='.')
-
-    out_cols = [m['target'] for m in mappings]
-    out_df = pd.DataFrame(index=df_flat.index)
+    df_flat = _flatten_rows(rows)
 
-    # Apply mappings
-    invalid_mask = pd.Series(False, index=df_flat.index)
+    # Apply mappings, collecting columns so the frame is built once
+    cols: Dict[str, pd.Series] = {}
     for m in mappings:
         source = m['source']
         target = m['target']
@@ -106,26 +150,30 @@ def transform_data(config_path: str, execution_date: str) -> pd.DataFrame:
         offset = m.get('offset')
 
         series = df_flat[source] if source in df_flat.columns else pd.Series([pd.NA] * len(df_flat), index=df_flat.index)
-        converted = _convert_series(series, target_type, fmt=fmt, scale=scale, offset=offset)
-        out_df[target] = converted
-        # rows invalid if conversion resulted in NA for critical fields (all mapped fields considered critical)
-        invalid_mask = invalid_mask | converted.isna()
+        cols[target] = _convert_series(series, target_type, fmt=fmt, scale=scale, offset=offset)
+    out_df = pd.DataFrame(cols, index=df_flat.index, copy=False)
 
-    # Rows with any invalid mapped fields are dropped and logged
-    invalid_rows_df = df_flat[invalid_mask]
-    if len(invalid_rows_df) > 0:
-        invalid_rows_df.to_json(os.path.join(invalid_dir, 'transform_invalid_rows.json'), orient='records', indent=2)
-    clean_df = out_df[~invalid_mask].copy()
+    # rows invalid if conversion resulted in NA for critical fields (all mapped fields considered critical)
+    if cols:
+        invalid_mask = np.logical_or.reduce([c.isna().to_numpy() for c in cols.values()])
+    else:
+        invalid_mask = np.zeros(len(df_flat), dtype=bool)
 
-    # Add metadata
+    # Add metadata before filtering so the valid subset is materialized only once;
+    # columns are already in mapping order, followed by the metadata
     now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
-    clean_df['ingestion_timestamp'] = now_utc
-    clean_df['source'] = api_name
-
-    # Ensure exact columns order
-    clean_df = clean_df[out_cols + ['ingestion_timestamp', 'source']]
+    out_df['ingestion_timestamp'] = now_utc
+    out_df['source'] = api_name
 
-    return clean_df
+    # Rows with any invalid mapped fields are dropped and logged
+    if invalid_mask.any():
+        dump_records(df_flat.loc[invalid_mask], os.path.join(invalid_dir, 'transform_invalid_rows.json'))
+        clean_df = out_df.loc[~invalid_mask]
+        clean_df.index = pd.RangeIndex(len(clean_df))
+    else:
+        clean_df = out_df
+
+    return clean_df, staging_path
 
 
 if __name__ == '__main__':
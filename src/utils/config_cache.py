@@ -0,0 +1,53 @@
+import os
+import copy
+import glob
+import json
+import functools
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader  # libyaml C binding
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_config(path: str, mtime_ns: int):
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+def load_config(path: str):
+    """Load a YAML config, parsing each file at most once per modification.
+
+    The cache is keyed on the file's mtime so edited configs are picked up
+    without a restart. Callers get their own copy and may mutate it freely.
+    """
+    path = os.path.abspath(path)
+    return copy.deepcopy(_parse_config(path, os.stat(path).st_mtime_ns))
+
+
+def schedule_sidecar_path(config_path: str) -> str:
+    """Path of the JSON file holding a config's schedule, e.g. configs/sample_api.schedule.json."""
+    return os.path.splitext(config_path)[0] + '.schedule.json'
+
+
+def write_schedule_sidecars(configs_dir: str):
+    """Write a schedule sidecar next to every YAML config so DAG parsing can skip YAML."""
+    written = []
+    for cfg_path in sorted(glob.glob(os.path.join(configs_dir, '*.yaml'))):
+        config = load_config(cfg_path) or {}
+        sidecar = schedule_sidecar_path(cfg_path)
+        with open(sidecar, 'w') as f:
+            json.dump({'schedule': config.get('schedule')}, f)
+        written.append(sidecar)
+    return written
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('configs_dir', type=str, help="Directory of API YAML configs")
+    args = parser.parse_args()
+    for path in write_schedule_sidecars(args.configs_dir):
+        print(f"Wrote {path}")
@@ -0,0 +1,106 @@
+import os
+import json
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib parser
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # Large files are then parsed whole like any other
+
+# Files above this size are streamed record by record when ijson is available
+STREAM_THRESHOLD_BYTES = 32 * 1024 * 1024
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(obj: Any) -> Any:
+    # Object arrays (list cells from Arrow), timestamps, and anything else orjson cannot encode natively
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dump_json(obj: Any, path: str) -> None:
+    """Write an object as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, default=_default,
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; the stdlib encoder handles those
+        else:
+            with open(path, 'wb') as f:
+                f.write(data)
+            return
+    with open(path, 'w') as f:
+        json.dump(obj, f, indent=2, default=_default)
+
+
+def dump_records(df: pd.DataFrame, path: str) -> None:
+    """Write a frame as an indented JSON array of records, using orjson when it is installed."""
+    if orjson is None:
+        df.to_json(path, orient='records', indent=2)
+        return
+    dump_json(df.astype(object).where(df.notna(), None).to_dict('records'), path)
+
+
+def _starts_array(f) -> bool:
+    """Whether the file's top-level JSON value is an array; rewinds the file."""
+    head = f.read(64).lstrip()
+    f.seek(0)
+    return head.startswith(b'[')
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Read a raw response file as a list of records (a top-level object is one record)."""
+    with open(path, 'rb') as f:
+        if ijson is not None and os.fstat(f.fileno()).st_size > STREAM_THRESHOLD_BYTES and _starts_array(f):
+            # Never hold the whole file in memory alongside the parsed records
+            return list(ijson.items(f, 'item', use_float=True))
+        data = loads(f.read())
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return [data]
+    return []
+
+
+def list_json_files(directory: str) -> List[str]:
+    """Sorted paths of the *.json files in a directory; empty if it does not exist.
+
+    A single scandir pass replaces glob's per-entry fnmatch; dot-files are skipped as glob does.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(e.path for e in entries if e.name.endswith('.json') and not e.name.startswith('.'))
+    except FileNotFoundError:
+        return []
+
+
+def load_rows(paths: Sequence[str], max_workers: int = 8) -> List[Dict[str, Any]]:
+    """Read many response files concurrently and concatenate their records in path order.
+
+    File reads release the GIL, so threads overlap I/O across files; decoding still
+    takes the GIL since it builds Python objects.
+    """
+    if len(paths) <= 1:
+        return list(itertools.chain.from_iterable(load_records(p) for p in paths))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+        return list(itertools.chain.from_iterable(executor.map(load_records, paths)))
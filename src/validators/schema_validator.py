@@ -2,7 +2,8 @@ import os
 import sys
 import yaml
 import json
-import glob
+import functools
+import numpy as np
 import pandas as pd
 try:
     import pandera.pandas as pa  # new namespaced import
@@ -16,23 +17,36 @@ except Exception:  # fallback for older pandera versions
         from pandera.errors import SchemaErrors
     except Exception:  # very old versions
         SchemaErrors = pa.errors.SchemaErrors  # type: ignore[attr-defined]
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
+from src.utils.config_cache import load_config
+from src.utils.json_io import dump_json, list_json_files, load_rows
+
+try:
+    from yaml import CSafeDumper as _Dumper  # libyaml C binding
+except ImportError:
+    from yaml import SafeDumper as _Dumper
+
+# NumPy dtype kind codes -> schema labels; anything else is treated as a string
+_KIND_TO_DTYPE = {"i": "int", "u": "int", "f": "float", "b": "bool", "M": "datetime"}
+
+def _dtype_label(dtype):
+    return _KIND_TO_DTYPE.get(dtype.kind, "string")
 
 def infer_dtype(series):
-    if pd.api.types.is_integer_dtype(series):
-        return "int"
-    elif pd.api.types.is_float_dtype(series):
-        return "float"
-    elif pd.api.types.is_bool_dtype(series):
-        return "bool"
-    elif pd.api.types.is_datetime64_any_dtype(series):
-        return "datetime"
-    else:
-        return "string"
+    return _dtype_label(series.dtype)
+
+def _columns_to_frame(rows: List[Dict[str, Any]], columns: List[str]) -> pd.DataFrame:
+    """Build a frame of just `columns` column by column; columns no row carries are left out.
+
+    Non-object records (a page of scalars) count as rows without fields.
+    """
+    records = [row if isinstance(row, dict) else {} for row in rows]
+    present = [col for col in columns if any(col in row for row in records)]
+    return pd.DataFrame({col: [row.get(col) for row in records] for col in present}, index=pd.RangeIndex(len(rows)))
 
 def infer_schema(df: pd.DataFrame) -> Dict[str, Any]:
-    dtypes = {col: infer_dtype(df[col]) for col in df.columns}
+    dtypes = {col: _dtype_label(dtype) for col, dtype in df.dtypes.items()}
     return {
         "required_columns": list(df.columns),
         "dtypes": dtypes,
@@ -51,10 +65,20 @@ def dtype_to_pandera(dtype):
         "bool": pa.Bool
     }[dtype]
 
+@functools.lru_cache(maxsize=32)
+def _build_schema(schema_key: str):
+    """Compile the Pandera schema for a JSON-serialized `schema` config block."""
+    schema_cfg = json.loads(schema_key)
+    columns = {}
+    non_null_fields = set(schema_cfg.get('validation', {}).get('non_null_fields', []))
+    for col in schema_cfg['required_columns']:
+        dtype = schema_cfg['dtypes'][col]
+        columns[col] = pa.Column(dtype_to_pandera(dtype), nullable=(col not in non_null_fields))
+    return pa.DataFrameSchema(columns, coerce=True)
+
 def validate_schema(config_path: str, execution_date: str) -> dict:
     # Load config
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config(config_path)
     api_name = config['name']
     schema_cfg = config.get('schema')
 
@@ -77,77 +101,79 @@ def validate_schema(config_path: str, execution_date: str) -> dict:
     invalid_dir = os.path.join(base_dir, 'data', 'invalid', api_name, execution_date)
     os.makedirs(invalid_dir, exist_ok=True)
 
-    files = sorted(glob.glob(os.path.join(raw_dir, '*.json')))
-    all_rows = []
-    for file in files:
-        with open(file, 'r') as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                all_rows.extend(data)
-            elif isinstance(data, dict):
-                all_rows.append(data)
+    files = list_json_files(raw_dir)
+    all_rows = load_rows(files)
     if not all_rows:
         return {"valid_rows": 0, "invalid_rows": 0, "errors": ["No data found."]}
 
-    df = pd.DataFrame(all_rows)
     errors = []
     valid_rows = 0
     invalid_rows = 0
 
     if schema_cfg:
-        # Build Pandera schema
-        columns = {}
-        non_null_fields = set(schema_cfg.get('validation', {}).get('non_null_fields', []))
-        for col in schema_cfg['required_columns']:
-            dtype = schema_cfg['dtypes'][col]
-            columns[col] = pa.Column(dtype_to_pandera(dtype), nullable=(col not in non_null_fields))
-        schema = pa.DataFrameSchema(columns, coerce=True)
-        # Validate
+        validation_cfg = schema_cfg.get('validation', {})
+        # Only the fields the schema and checks read are materialized
+        df = _columns_to_frame(all_rows, list(dict.fromkeys(
+            schema_cfg['required_columns'] + validation_cfg.get('unique_keys', []) + validation_cfg.get('non_null_fields', []))))
+        # Build Pandera schema (reused across runs while the schema config is unchanged)
+        schema = _build_schema(json.dumps(schema_cfg, sort_keys=True, default=str))
+        # Rows with nulls in non-null fields are invalid outright. Pandera builds a
+        # failure case for every null, which is slow on sparse columns, so such rows
+        # are split off with one vectorized mask and only the dense rest is validated
+        null_fields = [f for f in validation_cfg.get('non_null_fields', []) if f in df.columns]
+        # One isna pass serves both the row mask and the per-field report below
+        nulls = df[null_fields].isna()
+        null_mask = nulls.any(axis=1).to_numpy()
+        # Positional mask of invalid rows (the frame has a RangeIndex)
+        invalid_mask = null_mask.copy()
+        # Validate only the schema's columns; pandera copies and coerces the frame it
+        # is given, and absent columns are left out so they still fail as missing
+        projected = [col for col in schema_cfg['required_columns'] if col in df.columns]
         try:
-            validated = schema.validate(df, lazy=True)
-            valid_rows = len(validated)
+            schema.validate(df.loc[~null_mask, projected] if null_mask.any() else df[projected], lazy=True)
         except SchemaErrors as e:
             failure_cases = e.failure_cases
             # Extract only valid integer indices from failure cases
-            raw_indices = failure_cases.get('index') if 'index' in failure_cases else []
-            if hasattr(raw_indices, 'tolist'):
-                raw_indices = raw_indices.tolist()
-            valid_indices = [i for i in raw_indices if isinstance(i, int)]
-            if len(valid_indices) > 0:
-                invalid_idx_set = set(valid_indices)
-                valid_rows = len(df) - len(invalid_idx_set)
-                invalid_rows = len(invalid_idx_set)
-                # Log invalid rows by index
-                invalid_df = df.loc[sorted(invalid_idx_set)]
-                invalid_df.to_json(os.path.join(invalid_dir, 'invalid_rows.json'), orient='records', indent=2)
+            if 'index' in failure_cases:
+                raw_indices = pd.to_numeric(failure_cases['index'], errors='coerce').dropna()
+                valid_indices = np.unique(raw_indices.to_numpy(dtype=np.int64))
+            else:
+                valid_indices = np.empty(0, dtype=np.int64)
+            if valid_indices.size > 0:
+                invalid_mask[valid_indices] = True
             else:
                 # When no row index is provided (e.g., missing column), treat all rows as invalid
-                valid_rows = 0
-                invalid_rows = len(df)
-                df.to_json(os.path.join(invalid_dir, 'invalid_rows.json'), orient='records', indent=2)
+                invalid_mask[:] = True
             errors = failure_cases.to_dict('records')
+        # Non-null fields
+        for field, has_null in nulls.any(axis=0).items():
+            if has_null:
+                errors.append(f"Null values found in non_null_field: {field}")
+        invalid_rows = int(invalid_mask.sum())
+        if invalid_rows:
+            valid_rows = len(df) - invalid_rows
+            # Log invalid rows by index, from the raw records so no field is dropped
+            dump_json([all_rows[i] for i in np.flatnonzero(invalid_mask)], os.path.join(invalid_dir, 'invalid_rows.json'))
             # Fail if >5% invalid
-            if len(df) > 0 and invalid_rows / len(df) > 0.05:
+            if invalid_rows / len(df) > 0.05:
                 return {"valid_rows": valid_rows, "invalid_rows": invalid_rows, "errors": errors}
+        else:
+            valid_rows = len(df)
         # Unique keys
-        unique_keys = schema_cfg.get('validation', {}).get('unique_keys', [])
+        unique_keys = validation_cfg.get('unique_keys', [])
         if unique_keys:
             if df.duplicated(subset=unique_keys).any():
                 errors.append(f"Duplicate values found in unique_keys: {unique_keys}")
-        # Non-null fields
-        for field in schema_cfg.get('validation', {}).get('non_null_fields', []):
-            if df[field].isnull().any():
-                errors.append(f"Null values found in non_null_field: {field}")
         return {"valid_rows": valid_rows, "invalid_rows": invalid_rows, "errors": errors}
     else:
         # Infer schema
-        sample_df = df.head(100)
+        sample_df = pd.DataFrame(all_rows).head(100)
         inferred = infer_schema(sample_df)
         inferred_dir = os.path.join(base_dir, 'configs', 'inferred_schemas')
         os.makedirs(inferred_dir, exist_ok=True)
         with open(os.path.join(inferred_dir, f"{api_name}.yaml"), 'w') as f:
-            yaml.safe_dump(inferred, f)
-        return {"valid_rows": len(df), "invalid_rows": 0, "errors": [], "inferred_schema": inferred}
+            yaml.dump(inferred, f, Dumper=_Dumper)
+        return {"valid_rows": len(all_rows), "invalid_rows": 0, "errors": [], "inferred_schema": inferred}
 
 if __name__ == "__main__":
     import argparse
@@ -1,5 +1,4 @@
 import os
-import glob
 import json
 from datetime import datetime, timedelta
 
@@ -7,7 +6,7 @@ import pandas as pd
 import plotly.express as px
 import requests
 import streamlit as st
-import streamlit.components.v1 as components
+from streamlit_autorefresh import st_autorefresh
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 import yaml
@@ -33,37 +32,76 @@ PG_DB = os.getenv("POSTGRES_DB", "airflow")
 REFRESH_SEC = int(os.getenv("DASHBOARD_REFRESH_SEC", "30"))
 
 
+@st.cache_resource
 def get_engine():
 	uri = f"postgresql+psycopg2://{PG_USER}:{PG_PASSWORD}@{PG_HOST}:{PG_PORT}/{PG_DB}"
 	return create_engine(uri)
 
 
+def _yaml_stems(configs_dir):
+	try:
+		with os.scandir(configs_dir) as entries:
+			return sorted(e.name[:-5] for e in entries if e.name.endswith(".yaml") and not e.name.startswith("."))
+	except FileNotFoundError:
+		return []
+
+
+@st.cache_data(ttl=60)
 def list_api_configs():
-	files = sorted(glob.glob(os.path.join("/app", "..", "configs", "*.yaml")))
+	names = _yaml_stems(os.path.join("/app", "..", "configs"))
 	# fallback for running on host
-	if not files:
-		files = sorted(glob.glob(os.path.join("configs", "*.yaml")))
-	return [os.path.splitext(os.path.basename(f))[0] for f in files]
+	if not names:
+		names = _yaml_stems("configs")
+	return names
+
+
+@st.cache_data(ttl=REFRESH_SEC)
+def _query_runs(limit):
+	# Cached per refresh interval; failures raise and are not cached
+	with get_engine().connect() as conn:
+		sql = text(
+			"""
+			SELECT dag_id, run_date, rows_processed, duration_sec, status, created_at
+			FROM pipeline_monitor
+			ORDER BY created_at DESC
+			LIMIT :lim
+			"""
+		)
+		return pd.read_sql(sql, conn, params={"lim": limit})
 
 
 def fetch_runs(limit=50):
 	try:
-		with get_engine().connect() as conn:
-			sql = text(
-				"""
-				SELECT dag_id, run_date, rows_processed, duration_sec, status, created_at
-				FROM pipeline_monitor
-				ORDER BY created_at DESC
-				LIMIT :lim
-				"""
-			)
-			df = pd.read_sql(sql, conn, params={"lim": limit})
-		return df
+		return _query_runs(limit)
 	except Exception as e:
 		st.error(f"Failed to fetch runs: {e}")
 		return pd.DataFrame()
 
 
+@st.cache_data(ttl=REFRESH_SEC)
+def _query_kpis(cutoff):
+	with get_engine().connect() as conn:
+		sql = text(
+			"""
+			SELECT COUNT(*) AS runs,
+			       AVG((status = 'success')::int) * 100 AS success_rate
+			FROM pipeline_monitor
+			WHERE created_at >= :cutoff
+			"""
+		)
+		return dict(conn.execute(sql, {"cutoff": cutoff}).mappings().one())
+
+
+def fetch_kpis(days=7):
+	# Truncated to the minute so reruns within an interval share the cache entry
+	cutoff = (datetime.utcnow() - timedelta(days=days)).replace(second=0, microsecond=0)
+	try:
+		return _query_kpis(cutoff)
+	except Exception as e:
+		st.error(f"Failed to fetch KPIs: {e}")
+		return {"runs": 0, "success_rate": None}
+
+
 def trigger_dag(api_config: str):
 	url = f"{AIRFLOW_BASE_URL}/api/v1/dags/api_etl_dag/dagRuns"
 	payload = {"conf": {"api_config": api_config}}
@@ -91,15 +129,8 @@ st.caption("Config-driven, API-agnostic ETL with Airflow 2.9")
 auto_refresh = st.sidebar.checkbox("Auto-refresh", value=True)
 st.sidebar.caption(f"Auto-refresh: every {REFRESH_SEC}s")
 if auto_refresh:
-		# Lightweight JS-based refresh (avoids deprecated experimental APIs)
-		components.html(
-				f"""
-				<script>
-					setTimeout(function() {{ window.location.reload(); }}, {REFRESH_SEC * 1000});
-				</script>
-				""",
-				height=0,
-		)
+	# Reruns the script in place; a page reload would refetch the whole frontend
+	st_autorefresh(interval=REFRESH_SEC * 1000, key="runs_refresh")
 
 
 # ------------------
@@ -124,12 +155,13 @@ if not runs.empty:
 	# Status badge coloring
 	def badge(s):
 		color = "green" if s == "success" else "red"
-		return f"<span style='color:{color};font-weight:600'>{s}</span>"
+		return f"color: {color}; font-weight: 600"
 
 	st.subheader("Recent Pipeline Runs")
-	show = runs.head(10).copy()
-	show["status"] = show["status"].apply(badge)
-	st.write(show.to_html(escape=False, index=False), unsafe_allow_html=True)
+	styled = runs.head(10).style
+	# Styler.applymap was renamed to Styler.map in pandas 2.1
+	styled = (styled.map if hasattr(styled, "map") else styled.applymap)(badge, subset=["status"])
+	st.dataframe(styled, hide_index=True, use_container_width=True)
 else:
 	st.info("No runs yet.")
 
@@ -143,17 +175,20 @@ col1, col2, col3 = st.columns(3)
 if not runs.empty:
 	# Rows processed time series
 	with col1:
-		ts = runs.sort_values("created_at").copy()
+		# Only the plotted columns, narrowed so the figure payload stays small
+		ts = runs[["created_at", "rows_processed"]].sort_values("created_at")
+		ts = ts.assign(
+			created_at=pd.to_datetime(ts["created_at"]),
+			rows_processed=pd.to_numeric(ts["rows_processed"], downcast="integer"),
+		)
 		fig = px.line(ts, x="created_at", y="rows_processed", title="Rows Processed Over Time")
 		st.plotly_chart(fig, use_container_width=True)
 
 	# Success rate last 7 days
 	with col2:
-		cutoff = datetime.utcnow() - timedelta(days=7)
-		last7 = runs[pd.to_datetime(runs["created_at"]) >= cutoff]
-		if not last7.empty:
-			rate = (last7["status"] == "success").mean() * 100
-			st.metric("Success Rate (7d)", f"{rate:.1f}%")
+		kpis = fetch_kpis(days=7)
+		if kpis["runs"]:
+			st.metric("Success Rate (7d)", f"{float(kpis['success_rate']):.1f}%")
 		else:
 			st.metric("Success Rate (7d)", "N/A")
 
@@ -178,14 +213,3 @@ anom = pd.DataFrame({
 	"severity": [],
 })
 st.data_editor(anom, num_rows="dynamic", use_container_width=True)
-
-
-# ------------------
-# Cache hygiene (new caching APIs)
-# ------------------
-try:
-	st.cache_resource.clear()
-	st.cache_data.clear()
-except Exception:
-	# Older Streamlit versions: no-op
-	pass
@@ -1,4 +1,5 @@
 import os
+import json
 import shutil
 import tempfile
 import pytest
@@ -6,7 +7,7 @@ import yaml
 from unittest import mock
 from src.extractors import api_adapter
 
-def make_config(tmpdir, pagination_type='page', empty_on_page=3):
+def make_config(tmpdir, pagination_type='page', empty_on_page=3, concurrency=None):
     config = {
         'name': 'test_api',
         'base_url': 'http://example.com',
@@ -20,6 +21,8 @@ def make_config(tmpdir, pagination_type='page', empty_on_page=3):
         },
         'rate_limit': {'requests_per_minute': 120}
     }
+    if concurrency:
+        config['pagination']['concurrency'] = concurrency
     config_path = os.path.join(tmpdir, 'test_config.yaml')
     with open(config_path, 'w') as f:
         yaml.safe_dump(config, f)
@@ -29,6 +32,7 @@ def mock_response(json_data, status=200):
     m = mock.Mock()
     m.status_code = status
     m.json.return_value = json_data
+    m.content = json.dumps(json_data).encode()
     return m
 
 @mock.patch('requests.Session.get')
@@ -55,3 +59,29 @@ def test_file_paths_and_rate_limit(mock_get, tmp_path):
         assert len(files) == 1
         assert files[0].endswith('response_001.json')
         mock_sleep.assert_called()
+
+@mock.patch('requests.Session.get')
+def test_concurrent_pages_saved_in_order(mock_get, tmp_path):
+    # Pages 1-4 have data, 5 onwards are empty; fetched in flights of 3
+    def respond(url, params=None, **kwargs):
+        page = params['page']
+        return mock_response([{'id': page}] if page <= 4 else [])
+    mock_get.side_effect = respond
+    config_path = make_config(tmp_path, concurrency=3)
+    with mock.patch('time.sleep'):
+        files = api_adapter.extract_api(config_path)
+    assert [os.path.basename(f) for f in files] == [f'response_{i:03d}.json' for i in range(1, 5)]
+    for i, f in enumerate(files, start=1):
+        with open(f) as fh:
+            assert json.load(fh) == [{'id': i}]
+    assert mock_get.call_count == 6
+
+@mock.patch('requests.Session.get')
+def test_session_reused_across_calls(mock_get, tmp_path):
+    mock_get.side_effect = [mock_response([]), mock_response([])]
+    config_path = make_config(tmp_path)
+    api_adapter._get_session.cache_clear()
+    api_adapter.extract_api(config_path)
+    api_adapter.extract_api(config_path)
+    assert api_adapter._get_session.cache_info().misses == 1
+    assert api_adapter._get_session.cache_info().hits == 1
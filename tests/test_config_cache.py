@@ -0,0 +1,47 @@
+import os
+import json
+import yaml
+from src.utils import config_cache
+
+
+def write_config(path, cfg):
+    with open(path, 'w') as f:
+        yaml.safe_dump(cfg, f)
+
+
+def test_config_parsed_once_until_modified(tmp_path):
+    cfg_path = os.path.join(tmp_path, 'cfg.yaml')
+    write_config(cfg_path, {'name': 'first'})
+    config_cache._parse_config.cache_clear()
+
+    assert config_cache.load_config(cfg_path)['name'] == 'first'
+    assert config_cache.load_config(cfg_path)['name'] == 'first'
+    assert config_cache._parse_config.cache_info().hits == 1
+
+    write_config(cfg_path, {'name': 'second'})
+    stat = os.stat(cfg_path)
+    os.utime(cfg_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert config_cache.load_config(cfg_path)['name'] == 'second'
+
+
+def test_callers_get_independent_copies(tmp_path):
+    cfg_path = os.path.join(tmp_path, 'cfg.yaml')
+    write_config(cfg_path, {'name': 'api', 'params': {'per_page': 100}})
+
+    config = config_cache.load_config(cfg_path)
+    config['params']['page'] = 2
+
+    assert config_cache.load_config(cfg_path)['params'] == {'per_page': 100}
+
+
+def test_write_schedule_sidecars(tmp_path):
+    write_config(os.path.join(tmp_path, 'hourly.yaml'), {'name': 'a', 'schedule': '@hourly'})
+    write_config(os.path.join(tmp_path, 'manual.yaml'), {'name': 'b'})
+
+    written = config_cache.write_schedule_sidecars(str(tmp_path))
+
+    assert [os.path.basename(p) for p in written] == ['hourly.schedule.json', 'manual.schedule.json']
+    with open(written[0]) as f:
+        assert json.load(f) == {'schedule': '@hourly'}
+    with open(written[1]) as f:
+        assert json.load(f) == {'schedule': None}
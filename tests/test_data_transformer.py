@@ -2,7 +2,8 @@ import os
 import json
 import yaml
 import pandas as pd
-from src.transformers.data_transformer import transform_data
+from unittest import mock
+from src.transformers.data_transformer import transform_data, transform_and_stage
 
 
 def write_raw(tmpdir, api_name, execution_date, rows):
@@ -75,3 +76,127 @@ def test_metadata_columns(tmp_path):
     df = transform_data(cfg_path, date)
     assert 'ingestion_timestamp' in df.columns
     assert 'source' in df.columns
+
+
+def test_bool_conversion_strings(tmp_path):
+    api = 'test_api'
+    date = '2024-06-10'
+    rows = [
+        {'type': 'X', 'public': True},
+        {'type': 'Y', 'public': ' No '},
+        {'type': 'Z', 'public': '1'},
+        {'type': 'W', 'public': 'maybe'},
+    ]
+    mappings = [
+        {'source': 'type', 'target': 'event_type', 'type': 'string'},
+        {'source': 'public', 'target': 'is_public', 'type': 'bool'},
+    ]
+    write_raw(tmp_path, api, date, rows)
+    cfg_path = make_config(tmp_path, api, mappings)
+    df = transform_data(cfg_path, date)
+    assert df['event_type'].tolist() == ['X', 'Y', 'Z']
+    assert df['is_public'].tolist() == [True, False, True]
+
+
+def test_transform_stages_feather_for_load(tmp_path):
+    api = 'test_api'
+    date = '2024-06-10'
+    rows = [
+        {'type': 'PushEvent', 'repo': {'id': 123}},
+        {'type': 'ForkEvent', 'repo': {'id': 'bad'}},
+    ]
+    mappings = [
+        {'source': 'type', 'target': 'event_type', 'type': 'string'},
+        {'source': 'repo.id', 'target': 'repo_id', 'type': 'int'},
+    ]
+    write_raw(tmp_path, api, date, rows)
+    cfg_path = make_config(tmp_path, api, mappings)
+    df, staging_path = transform_and_stage(cfg_path, date)
+
+    assert os.path.exists(staging_path)
+    staged = pd.read_feather(staging_path)
+    pd.testing.assert_frame_equal(staged, df)
+    assert str(staged['repo_id'].dtype) == 'Int64'
+    # Plain transforms (the loader's fallback, the CLI) leave no staged file behind
+    os.remove(staging_path)
+    transform_data(cfg_path, date)
+    assert not os.path.exists(staging_path)
+
+
+def test_skipped_staging_removes_stale_file(tmp_path):
+    api = 'test_api'
+    date = '2024-06-10'
+    write_raw(tmp_path, api, date, [{'type': 'PushEvent'}])
+    cfg_path = make_config(tmp_path, api, [{'source': 'type', 'target': 'event_type', 'type': 'string'}])
+    _, staging_path = transform_and_stage(cfg_path, date)
+
+    with mock.patch.object(pd.DataFrame, 'to_feather', side_effect=ImportError):
+        _, skipped = transform_and_stage(cfg_path, date)
+
+    assert skipped is None
+    assert not os.path.exists(staging_path)
+
+
+def test_mixed_nested_types_still_flatten(tmp_path):
+    api = 'test_api'
+    date = '2024-06-10'
+    # 'repo' is an object in one row and a string in the other
+    rows = [
+        {'type': 'PushEvent', 'repo': {'id': 123}},
+        {'type': 'ForkEvent', 'repo': 'unknown'},
+    ]
+    mappings = [
+        {'source': 'type', 'target': 'event_type', 'type': 'string'},
+        {'source': 'repo.id', 'target': 'repo_id', 'type': 'int'},
+    ]
+    write_raw(tmp_path, api, date, rows)
+    cfg_path = make_config(tmp_path, api, mappings)
+    df = transform_data(cfg_path, date)
+    assert df['event_type'].tolist() == ['PushEvent']
+    assert df['repo_id'].tolist() == [123]
+
+
+def test_ints_beyond_int64_still_flatten(tmp_path):
+    api = 'test_api'
+    date = '2024-06-10'
+    # Arrow cannot hold 2**63 or above; such rows take the json_normalize path
+    rows = [
+        {'type': 'PushEvent', 'id': 1, 'big': None},
+        {'type': 'ForkEvent', 'id': 2, 'big': 2**63},
+    ]
+    mappings = [
+        {'source': 'type', 'target': 'event_type', 'type': 'string'},
+        {'source': 'id', 'target': 'event_id', 'type': 'int'},
+    ]
+    write_raw(tmp_path, api, date, rows)
+    cfg_path = make_config(tmp_path, api, mappings)
+    df = transform_data(cfg_path, date)
+    assert df['event_type'].tolist() == ['PushEvent', 'ForkEvent']
+    assert df['event_id'].tolist() == [1, 2]
+
+
+def test_list_fields_keep_python_lists(tmp_path):
+    api = 'test_api'
+    date = '2024-06-10'
+    rows = [
+        {'type': 'PushEvent', 'tags': ['a', 'b']},
+        {'type': 'ForkEvent', 'tags': []},
+    ]
+    mappings = [
+        {'source': 'type', 'target': 'event_type', 'type': 'string'},
+        {'source': 'tags', 'target': 'tags', 'type': 'string'},
+    ]
+    write_raw(tmp_path, api, date, rows)
+    cfg_path = make_config(tmp_path, api, mappings)
+    df = transform_data(cfg_path, date)
+    assert df['tags'].tolist() == ["['a', 'b']", '[]']
+
+
+def test_scalar_rows_do_not_crash(tmp_path):
+    api = 'test_api'
+    date = '2024-06-10'
+    mappings = [{'source': 'id', 'target': 'event_id', 'type': 'int'}]
+    write_raw(tmp_path, api, date, [1, 2, 3])
+    cfg_path = make_config(tmp_path, api, mappings)
+    df = transform_data(cfg_path, date)
+    assert df.empty
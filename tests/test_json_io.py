@@ -0,0 +1,96 @@
+import os
+import json
+import pytest
+import pandas as pd
+from unittest import mock
+from src.utils import json_io
+
+
+def write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+    return path
+
+
+def test_load_records_list_and_object(tmp_path):
+    list_path = write_json(os.path.join(tmp_path, 'a.json'), [{'id': 1}, {'id': 2}])
+    obj_path = write_json(os.path.join(tmp_path, 'b.json'), {'id': 3})
+    scalar_path = write_json(os.path.join(tmp_path, 'c.json'), 42)
+
+    assert json_io.load_records(list_path) == [{'id': 1}, {'id': 2}]
+    assert json_io.load_records(obj_path) == [{'id': 3}]
+    assert json_io.load_records(scalar_path) == []
+
+
+def test_load_rows_keeps_file_order(tmp_path):
+    paths = [
+        write_json(os.path.join(tmp_path, f'response_{i:03d}.json'), [{'id': i * 10}, {'id': i * 10 + 1}])
+        for i in range(1, 6)
+    ]
+    paths.append(write_json(os.path.join(tmp_path, 'response_006.json'), {'id': 60}))
+
+    rows = json_io.load_rows(paths, max_workers=3)
+
+    assert [r['id'] for r in rows] == [10, 11, 20, 21, 30, 31, 40, 41, 50, 51, 60]
+    assert json_io.load_rows([]) == []
+
+
+def test_large_array_files_are_streamed(tmp_path, monkeypatch):
+    pytest.importorskip('ijson')
+    monkeypatch.setattr(json_io, 'STREAM_THRESHOLD_BYTES', 10)
+    array_path = write_json(os.path.join(tmp_path, 'big.json'), [{'id': 1, 'score': 0.5}, {'id': 2, 'score': None}])
+    obj_path = write_json(os.path.join(tmp_path, 'obj.json'), {'id': 3, 'items': [1, 2, 3]})
+
+    with mock.patch.object(json_io, 'loads', wraps=json_io.loads) as mock_loads:
+        records = json_io.load_records(array_path)
+        mock_loads.assert_not_called()
+    assert records == [{'id': 1, 'score': 0.5}, {'id': 2, 'score': None}]
+    assert type(records[0]['score']) is float
+    assert json_io.load_records(obj_path) == [{'id': 3, 'items': [1, 2, 3]}]
+
+
+def test_list_json_files(tmp_path):
+    for name in ['response_002.json', 'response_001.json', '.hidden.json', 'notes.txt']:
+        (tmp_path / name).write_text('[]')
+
+    assert [os.path.basename(p) for p in json_io.list_json_files(str(tmp_path))] == ['response_001.json', 'response_002.json']
+    assert json_io.list_json_files(os.path.join(tmp_path, 'missing')) == []
+
+
+def test_dump_records(tmp_path):
+    df = pd.DataFrame({
+        'id': pd.array([1, None], dtype='Int64'),
+        'score': [0.5, float('nan')],
+        'created_at': pd.to_datetime(['2024-06-10T12:00:00', None]),
+        'payload': [{'k': 1}, None],
+    })
+    path = os.path.join(tmp_path, 'invalid_rows.json')
+
+    json_io.dump_records(df, path)
+
+    with open(path) as f:
+        assert json.load(f) == [
+            {'id': 1, 'score': 0.5, 'created_at': '2024-06-10T12:00:00', 'payload': {'k': 1}},
+            {'id': None, 'score': None, 'created_at': None, 'payload': None},
+        ]
+
+
+def test_dump_records_keeps_arrow_list_cells(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    # Arrow hands list columns to pandas as numpy object arrays
+    df = pa.table({'id': [1, 2], 'tags': [['z'], ['a', 'b']]}).to_pandas()
+    path = os.path.join(tmp_path, 'invalid_rows.json')
+
+    json_io.dump_records(df, path)
+
+    with open(path) as f:
+        assert json.load(f) == [{'id': 1, 'tags': ['z']}, {'id': 2, 'tags': ['a', 'b']}]
+
+
+def test_dump_json_handles_ints_beyond_64_bits(tmp_path):
+    path = os.path.join(tmp_path, 'rows.json')
+
+    json_io.dump_json([{'id': 2**64, 'n': 5}], path)
+
+    with open(path) as f:
+        assert json.load(f) == [{'id': 2**64, 'n': 5}]
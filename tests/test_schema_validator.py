@@ -89,3 +89,65 @@ def test_inference_works(tmp_path):
     report = schema_validator.validate_schema(config_path, execution_date)
     assert 'inferred_schema' in report
     assert set(report['inferred_schema']['required_columns']) == {'id', 'type', 'created_at'}
+
+def test_null_non_null_fields_are_invalid(tmp_path):
+    api_name = 'test_api'
+    execution_date = '2024-06-10'
+    rows = [
+        {'id': 1, 'type': 'PushEvent', 'created_at': '2024-06-10T12:00:00Z'},
+        {'id': 2, 'type': None, 'created_at': '2024-06-10T13:00:00Z', 'payload': {'size': 3}, 'count': 5},
+        {'id': 'bad', 'type': 'PushEvent', 'created_at': '2024-06-10T14:00:00Z'}
+    ]
+    schema = {
+        'required_columns': ['id', 'type', 'created_at'],
+        'dtypes': {'id': 'int', 'type': 'string', 'created_at': 'datetime'},
+        'validation': {'unique_keys': ['id'], 'non_null_fields': ['type']}
+    }
+    make_raw_dir(tmp_path, api_name, execution_date, rows)
+    config_path = make_config(tmp_path, api_name, schema)
+    report = schema_validator.validate_schema(config_path, execution_date)
+    assert report['valid_rows'] == 1
+    assert report['invalid_rows'] == 2
+    assert "Null values found in non_null_field: type" in report['errors']
+    with open(os.path.join(tmp_path, 'data', 'invalid', api_name, execution_date, 'invalid_rows.json')) as f:
+        logged = json.load(f)
+    assert [r['id'] for r in logged] == [2, 'bad']
+    assert logged[0]['payload'] == {'size': 3}
+    # Raw records are logged as-is: no float upcast, no padding of absent fields
+    assert type(logged[0]['count']) is int
+    assert 'count' not in logged[1]
+
+def test_schema_built_once_per_config(tmp_path):
+    api_name = 'test_api'
+    rows = [{'id': 1, 'type': 'PushEvent', 'created_at': '2024-06-10T12:00:00Z'}]
+    schema = {
+        'required_columns': ['id', 'type', 'created_at'],
+        'dtypes': {'id': 'int', 'type': 'string', 'created_at': 'datetime'},
+        'validation': {'unique_keys': ['id'], 'non_null_fields': ['type']}
+    }
+    make_raw_dir(tmp_path, api_name, '2024-06-10', rows)
+    make_raw_dir(tmp_path, api_name, '2024-06-11', rows)
+    config_path = make_config(tmp_path, api_name, schema)
+    schema_validator._build_schema.cache_clear()
+
+    schema_validator.validate_schema(config_path, '2024-06-10')
+    report = schema_validator.validate_schema(config_path, '2024-06-11')
+
+    assert report['valid_rows'] == 1
+    assert schema_validator._build_schema.cache_info().misses == 1
+    assert schema_validator._build_schema.cache_info().hits == 1
+
+def test_scalar_records_are_invalid(tmp_path):
+    api_name = 'test_api'
+    execution_date = '2024-06-10'
+    schema = {
+        'required_columns': ['id', 'type'],
+        'dtypes': {'id': 'int', 'type': 'string'},
+        'validation': {'unique_keys': ['id'], 'non_null_fields': ['type']}
+    }
+    make_raw_dir(tmp_path, api_name, execution_date, [1, 2, 3])
+    config_path = make_config(tmp_path, api_name, schema)
+    report = schema_validator.validate_schema(config_path, execution_date)
+    assert report['valid_rows'] == 0
+    assert report['invalid_rows'] == 3
+    assert any('id' in str(e) for e in report['errors'])